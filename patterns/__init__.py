@@ -0,0 +1 @@
+"""Amazon Bedrock reliability patterns."""
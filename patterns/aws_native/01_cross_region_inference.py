@@ -12,29 +12,76 @@ import sys
 import time
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import Dict, Any, List
 from datetime import datetime
 from pathlib import Path
+from botocore.config import Config
+
+# Running the file directly has no parent package; make it importable so the
+# relative import below works both as a script and with python -m
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "patterns.aws_native"
 
 # Import security utilities
-sys.path.append(str(Path(__file__).parent.parent))
-from security_utils import (
+from ..security_utils import (
     validate_model_id, sanitize_prompt, sanitize_error_message,
     get_secure_region, create_secure_log_file, RateLimiter,
     RetryHandler, CircuitBreaker, ResourceManager, validate_config,
-    setup_logging, timeout_context
+    setup_logging
 )
 
+_REGION_RE = re.compile(r'^[a-z0-9-]+$')
+
+# Seconds allowed to open a connection to Bedrock
+CONNECT_TIMEOUT = 5
+
+
+def _raise_if_past(deadline: float, seconds: float):
+    """Raise TimeoutError once a time.monotonic() deadline has passed."""
+    if time.monotonic() > deadline:
+        raise TimeoutError(f"Operation timed out after {seconds} seconds")
+
 class CrossRegionInference:
-    def __init__(self, region: str = None):
+    def __init__(self, region: str = None, max_parallel_requests: int = None):
         """Initialize with cross-region inference profiles."""
         self.region = region or get_secure_region()
-        if not re.match(r'^[a-z0-9-]+$', self.region):
+        if not _REGION_RE.match(self.region):
             raise ValueError("Invalid region format")
 
+        # Bedrock calls are I/O-bound, so size the pool well beyond the
+        # executor default of cpu_count() + 4
+        self.max_parallel_requests = max_parallel_requests or max((os.cpu_count() or 1) * 5, 32)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_parallel_requests)
+
+        # Validated configuration
+        self.config = validate_config({
+            'timeout': 30,
+            'max_tokens': 1000,
+            'temperature': 0.7
+        })
+
+        # One session and config for both clients: enough pooled HTTPS
+        # connections for every worker thread so concurrent calls reuse open
+        # connections instead of waiting on a smaller pool, TCP keepalive
+        # probes so idle pooled sockets are not silently dropped, and no SDK
+        # retries since RetryHandler owns retries.
+        # The socket timeouts only bound each individual read; the overall
+        # per-call deadline is checked while consuming responses instead of
+        # with a process-wide SIGALRM, which cannot be armed from worker threads
+        client_config = Config(
+            max_pool_connections=self.max_parallel_requests,
+            tcp_keepalive=True,
+            retries={'mode': 'standard', 'max_attempts': 0},
+            connect_timeout=CONNECT_TIMEOUT,
+            read_timeout=self.config['timeout']
+        )
+        self._session = boto3.Session(region_name=self.region)
+
         # Initialize clients with timeout
-        self.client = boto3.client('bedrock-runtime', region_name=self.region)
-        self.bedrock_client = boto3.client('bedrock', region_name=self.region)
+        self.client = self._session.client('bedrock-runtime', config=client_config)
+        self.bedrock_client = self._session.client('bedrock', config=client_config)
 
         # Setup enhanced logging and utilities
         self.log_file = create_secure_log_file("cross_region_inference")
@@ -44,39 +91,85 @@ class CrossRegionInference:
         self.circuit_breaker = CircuitBreaker()
         self.resource_manager = ResourceManager()
 
-        # Initialize log entries
+        # Initialize log entries as (time_ns, message) pairs
         self.log_entries = []
 
-        # Validated configuration
-        self.config = validate_config({
-            'timeout': 30,
-            'max_tokens': 1000,
-            'temperature': 0.7
-        })
+        # Console lines are written out in one go per phase
+        self._console_buf: List[str] = []
+
+        # Inference profiles change rarely, so list them once per instance, in
+        # the background so the control-plane round trip overlaps with setup.
+        # The future keeps the result for every later demonstration; any error
+        # is held by it and only raised when the profiles are needed
+        self._profiles_future = self._executor.submit(
+            self.retry_handler.retry_with_backoff, self._fetch_profiles
+        )
+
+    def _profiles_wait_timeout(self) -> float:
+        """Worst-case time for the retried profile listing to finish.
+
+        Every attempt runs until its deadline, plus the connect and read
+        timeouts of the page request still in flight at that moment, followed
+        by the largest backoff the retry handler can choose.
+        """
+        handler = self.retry_handler
+        attempts = handler.max_retries + 1
+        per_attempt = self.config['timeout'] + CONNECT_TIMEOUT + self.config['timeout']
+        backoff = sum(
+            min(handler.max_backoff, handler.backoff * (2 ** attempt))
+            for attempt in range(handler.max_retries)
+        )
+        return attempts * per_attempt + backoff
+
+    def close(self):
+        """Release the request pool without waiting for queued work."""
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def log(self, message: str):
-        """Add message to detailed log entries."""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_entries.append(f"[{timestamp}] {message}")
+        """Add message to detailed log entries.
+
+        Entries keep the raw nanosecond timestamp; formatting is deferred to save_log.
+        """
+        self.log_entries.append((time.time_ns(), message))
 
     def console(self, message: str):
-        """Print to console only."""
-        print(message)
+        """Queue a line for the console; it is written on the next flush."""
+        self._console_buf.append(message)
+
+    def _flush_console(self):
+        """Write queued console lines with a single stdout write."""
+        if self._console_buf:
+            sys.stdout.write("\n".join(self._console_buf) + "\n")
+            sys.stdout.flush()
+            self._console_buf.clear()
 
     def save_log(self):
         """Save detailed log entries to file with secure permissions."""
         try:
             # Security: Create file with restricted permissions
             self.log_file.touch(mode=0o640)
-            with open(self.log_file, "w", encoding="utf-8") as f:
-                f.write("=== CROSS-REGION INFERENCE LOG ===\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Region: {self.region}\n")
-                f.write("=" * 50 + "\n\n")
-                # Security: Sanitize log entries
-                for entry in self.log_entries:
-                    sanitized_entry = entry.replace(str(Path.home()), "~")
-                    f.write(sanitized_entry + "\n")
+            header = (
+                "=== CROSS-REGION INFERENCE LOG ===\n"
+                f"Timestamp: {datetime.now().isoformat()}\n"
+                f"Region: {self.region}\n"
+                + "=" * 50 + "\n\n"
+            )
+            # Security: Sanitize log entries
+            home = str(Path.home())
+            body = "".join(
+                f"[{datetime.fromtimestamp(stamp / 1e9).strftime('%H:%M:%S')}] {message.replace(home, '~')}\n"
+                for stamp, message in self.log_entries
+            )
+            # A single large write fits in the 64 KiB buffer
+            with open(self.log_file, "w", encoding="utf-8", buffering=1 << 16) as f:
+                f.write(header)
+                f.write(body)
         except Exception as e:
             self.console(f"Warning: Could not save log file: {sanitize_error_message(str(e))}")
 
@@ -95,42 +188,70 @@ class CrossRegionInference:
 
         self.logger.info(f"Cross-region inference request for profile: {profile_id}")
 
+        # Fail fast while the circuit is open: skip the rate-limit wait,
+        # retry stack and timing for a call that would be rejected anyway
+        if self.circuit_breaker.state == 'OPEN' and not self.circuit_breaker.should_attempt_reset():
+            self.logger.error("Cross-region inference skipped: circuit breaker is OPEN")
+            return {
+                'success': False,
+                'profile': profile_id,
+                'error': "Circuit breaker is OPEN",
+                'response_time': 0.0
+            }
+
         # Rate limiting
         self.rate_limiter.wait_if_needed()
 
         def _invoke():
-            with timeout_context(self.config['timeout']):
-                response = self.client.converse(
-                    modelId=profile_id,
-                    messages=[{"role": "user", "content": [{"text": prompt}]}],
-                    inferenceConfig={
-                        "maxTokens": self.config['max_tokens'],
-                        "temperature": self.config['temperature']
-                    }
-                )
-                return response
+            timeout = self.config['timeout']
+            deadline = time.monotonic() + timeout
+
+            # Stream the reply so text arrives as it is generated; the whole
+            # stream is consumed here so a mid-stream failure is retried too
+            response = self.client.converse_stream(
+                modelId=profile_id,
+                messages=[{"role": "user", "content": [{"text": prompt}]}],
+                inferenceConfig={
+                    "maxTokens": self.config['max_tokens'],
+                    "temperature": self.config['temperature']
+                }
+            )
+
+            parts = []
+            usage = {}
+            first_token_at = None
+            for event in response['stream']:
+                # read_timeout only catches a stalled stream, so also stop one
+                # that keeps trickling tokens past the total deadline
+                _raise_if_past(deadline, timeout)
+                if 'contentBlockDelta' in event:
+                    if first_token_at is None:
+                        first_token_at = time.time()
+                    parts.append(event['contentBlockDelta']['delta'].get('text', ''))
+                elif 'metadata' in event:
+                    usage = event['metadata'].get('usage', {})
+            return "".join(parts), usage, first_token_at
 
         try:
             start_time = time.time()
 
             # Use circuit breaker and retry logic
-            response = self.circuit_breaker.call(
+            content, usage, first_token_at = self.circuit_breaker.call(
                 self.retry_handler.retry_with_backoff, _invoke
             )
 
             end_time = time.time()
             response_time = end_time - start_time
+            first_token_time = first_token_at - start_time if first_token_at else response_time
 
-            content = response['output']['message']['content'][0]['text']
-            usage = response.get('usage', {})
-
-            self.logger.info(f"Response received: {response_time:.2f}s, tokens: {usage.get('outputTokens', 0)}")
+            self.logger.info(f"Response received: {response_time:.2f}s (first token {first_token_time:.2f}s), tokens: {usage.get('outputTokens', 0)}")
 
             return {
                 'success': True,
                 'profile': profile_id,
                 'content': content,
                 'response_time': response_time,
+                'first_token_time': first_token_time,
                 'usage': usage
             }
 
@@ -145,24 +266,44 @@ class CrossRegionInference:
                 'response_time': 0
             }
 
-    def get_available_profiles(self) -> List[Dict[str, Any]]:
-        """Get available cross-region inference profiles."""
-        self.log("Fetching available cross-region inference profiles...")
-
-        try:
-            response = self.bedrock_client.list_inference_profiles()
-            profiles = response.get('inferenceProfileSummaries', [])
-
-            self.log(f"Found {len(profiles)} cross-region inference profiles")
-            for profile in profiles:
-                self.log(f"Profile: {profile}")
+    def _invoke_profiles(self, requests: List[tuple]) -> List[Dict[str, Any]]:
+        """Invoke several (prompt, profile_id) pairs concurrently, preserving order.
 
-            return profiles
+        The boto3 client is thread-safe, so each blocking call (including its
+        circuit breaker and retry handling) runs on the shared request pool.
+        """
+        futures = [
+            self._executor.submit(self.invoke_model, prompt, profile_id)
+            for prompt, profile_id in requests
+        ]
 
-        except Exception as e:
-            error_msg = sanitize_error_message(str(e))
-            self.log(f"ERROR: {error_msg}")
-            return []
+        results = []
+        for (_, profile_id), future in zip(requests, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({
+                    'success': False,
+                    'profile': profile_id,
+                    'error': sanitize_error_message(str(e)),
+                    'response_time': 0
+                })
+        return results
+
+    def _fetch_profiles(self) -> List[Dict[str, Any]]:
+        """List system-defined inference profiles across pages.
+
+        Application profiles are filtered out server-side since the demonstration
+        only exercises the regional and global system-defined profiles.
+        """
+        timeout = self.config['timeout']
+        deadline = time.monotonic() + timeout
+        paginator = self.bedrock_client.get_paginator('list_inference_profiles')
+        profiles = []
+        for page in paginator.paginate(typeEquals='SYSTEM_DEFINED', PaginationConfig={'PageSize': 1000}):
+            _raise_if_past(deadline, timeout)
+            profiles.extend(page.get('inferenceProfileSummaries', []))
+        return profiles
 
     def demonstrate_cross_region_inference(self):
         """Demonstrate cross-region inference with enhanced error handling."""
@@ -179,6 +320,7 @@ class CrossRegionInference:
                 self.logger.error(f"Demonstration failed: {error_msg}")
                 raise
             finally:
+                self._flush_console()
                 self.logger.info("Cross-region inference demonstration completed")
 
     def _run_demonstration(self):
@@ -195,6 +337,7 @@ class CrossRegionInference:
         self.console("  • Distribute traffic across multiple AWS Regions for higher throughput")
         self.console("  • Optimize available resources and increase model throughput")
         self.console("")
+        self._flush_console()
 
         # Log the same information
         self.log("=== Cross-Region Inference Pattern Demonstration ===")
@@ -206,16 +349,19 @@ class CrossRegionInference:
 
         # Profile Discovery Phase
         self.console("🔍 Discovering inference profiles...")
+        self._flush_console()
         self.log("Phase 1: Profile Discovery")
 
-        def get_profiles():
-            response = self.bedrock_client.list_inference_profiles()
-            return response.get('inferenceProfileSummaries', [])
-
+        wait_timeout = self._profiles_wait_timeout()
+        error_msg = None
         try:
-            profiles = self.retry_handler.retry_with_backoff(get_profiles)
+            profiles = self._profiles_future.result(timeout=wait_timeout)
+        except FuturesTimeoutError:
+            error_msg = f"Profile listing did not finish within {wait_timeout:.0f}s"
         except Exception as e:
             error_msg = sanitize_error_message(str(e))
+
+        if error_msg is not None:
             self.console("❌ No cross-region profiles available")
             self.log(f"ERROR: Failed to get profiles: {error_msg}")
             self.logger.error(f"Failed to get profiles: {error_msg}")
@@ -226,9 +372,13 @@ class CrossRegionInference:
             self.log("No inference profiles found")
             return
 
-        # Categorize profiles using AWS terminology
-        regional_profiles = [p for p in profiles if not p['inferenceProfileId'].startswith('global.')]
-        global_profiles = [p for p in profiles if p['inferenceProfileId'].startswith('global.')]
+        # Categorize profiles using AWS terminology in a single pass
+        regional_profiles, global_profiles = [], []
+        for profile in profiles:
+            if profile['inferenceProfileId'].startswith('global.'):
+                global_profiles.append(profile)
+            else:
+                regional_profiles.append(profile)
 
         self.console(f"   → Regional profiles: {len(regional_profiles)} (tied to specific geography)")
         self.console(f"   → Global profiles: {len(global_profiles)} (route to optimal commercial AWS Region)")
@@ -243,63 +393,68 @@ class CrossRegionInference:
         self.log(f"Source region: {self.region}")
 
         # Test profiles with detailed explanations
-        results = []
+        tests = []
 
         if regional_profiles:
-            profile_id = regional_profiles[0]['inferenceProfileId']
-            prompt = "Explain AWS cross-region inference benefits in 2 sentences."
-            
-            self.console("🚀 Testing Regional Profile:")
-            self.console(f"   Profile: {profile_id}")
-            self.console(f"   → Source Region: {self.region}")
-            self.console(f"   → Prompt: {prompt}")
-            self.console("   → Amazon Bedrock routing decision: [Processing...]")
-            
-            self.log(f"Testing regional profile: {profile_id}")
-            self.log(f"Prompt: {prompt}")
-            
-            result = self.invoke_model(prompt, profile_id)
-            results.append(('Regional', result))
-
-            if result['success']:
-                self.console(f"   → Destination Region: Automatically selected by AWS")
-                self.console(f"   → Performance: {result['response_time']:.2f}s | Tokens: {result.get('usage', {}).get('outputTokens', 0)}")
-                self.console(f"   → Model Response: {result['content'][:100]}{'...' if len(result['content']) > 100 else ''}")
-                self.console("   ✅ Success: Cross-region inference handled traffic distribution")
-                self.log(f"Regional test successful: {result['response_time']:.2f}s, {result.get('usage', {}).get('outputTokens', 0)} tokens")
-                self.log(f"Full response: {result['content']}")
-            else:
-                self.console(f"   ❌ Failed: {result['error']}")
-                self.log(f"Regional test failed: {result['error']}")
-            self.console("")
+            tests.append({
+                'label': 'Regional',
+                'icon': "🚀",
+                'profile_id': regional_profiles[0]['inferenceProfileId'],
+                'prompt': "Explain AWS cross-region inference benefits in 2 sentences.",
+                'destination': "Automatically selected by AWS",
+                'outcome': "Cross-region inference handled traffic distribution"
+            })
 
         if global_profiles:
-            profile_id = global_profiles[0]['inferenceProfileId']
-            prompt = "Describe global inference capacity benefits in 2 sentences."
-            
-            self.console("🌍 Testing Global Profile:")
-            self.console(f"   Profile: {profile_id}")
+            tests.append({
+                'label': 'Global',
+                'icon': "🌍",
+                'profile_id': global_profiles[0]['inferenceProfileId'],
+                'prompt': "Describe global inference capacity benefits in 2 sentences.",
+                'destination': "Optimal commercial region selected",
+                'outcome': "Global inference profile found optimal capacity"
+            })
+
+        for test in tests:
+            self.console(f"{test['icon']} Testing {test['label']} Profile:")
+            self.console(f"   Profile: {test['profile_id']}")
             self.console(f"   → Source Region: {self.region}")
-            self.console(f"   → Prompt: {prompt}")
+            self.console(f"   → Prompt: {test['prompt']}")
             self.console("   → Amazon Bedrock routing decision: [Processing...]")
-            
-            self.log(f"Testing global profile: {profile_id}")
-            self.log(f"Prompt: {prompt}")
-            
-            result = self.invoke_model(prompt, profile_id)
-            results.append(('Global', result))
+            self.console("")
+
+            self.log(f"Testing {test['label'].lower()} profile: {test['profile_id']}")
+            self.log(f"Prompt: {test['prompt']}")
+
+        # Show what is being tested before blocking on the model calls
+        self._flush_console()
+
+        # Profiles are independent, so invoke them concurrently: wall time is
+        # the slowest round-trip rather than the sum of all of them
+        outcomes = self._invoke_profiles(
+            [(test['prompt'], test['profile_id']) for test in tests]
+        )
+
+        results = []
+
+        for test, result in zip(tests, outcomes):
+            results.append((test['label'], result))
 
+            self.console(f"{test['icon']} {test['label']} Profile Result:")
             if result['success']:
-                self.console(f"   → Destination Region: Optimal commercial region selected")
-                self.console(f"   → Performance: {result['response_time']:.2f}s | Tokens: {result.get('usage', {}).get('outputTokens', 0)}")
-                self.console(f"   → Model Response: {result['content'][:100]}{'...' if len(result['content']) > 100 else ''}")
-                self.console("   ✅ Success: Global inference profile found optimal capacity")
-                self.log(f"Global test successful: {result['response_time']:.2f}s, {result.get('usage', {}).get('outputTokens', 0)} tokens")
-                self.log(f"Full response: {result['content']}")
+                self.console(f"   → Destination Region: {test['destination']}")
+                self.console(f"   → Performance: {result['response_time']:.2f}s (first token: {result['first_token_time']:.2f}s) | Tokens: {result.get('usage', {}).get('outputTokens', 0)}")
+                content = result['content']
+                preview = content[:100] + ('…' if len(content) > 100 else '')
+                self.console(f"   → Model Response: {preview}")
+                self.console(f"   ✅ Success: {test['outcome']}")
+                self.log(f"{test['label']} test successful: {result['response_time']:.2f}s, {result.get('usage', {}).get('outputTokens', 0)} tokens")
+                self.log(f"Full response: {content}")
             else:
                 self.console(f"   ❌ Failed: {result['error']}")
-                self.log(f"Global test failed: {result['error']}")
+                self.log(f"{test['label']} test failed: {result['error']}")
             self.console("")
+            self._flush_console()
 
         # Results Summary with AWS Context
         successful_tests = sum(1 for _, result in results if result['success'])
@@ -329,13 +484,14 @@ class CrossRegionInference:
         self.log("Cross-region inference demonstration completed")
         
         self.console(f"\n📋 Detailed log: {self.log_file.name}")
+        self._flush_console()
         self.save_log()
 
 def main():
     """Main execution function with error handling."""
     try:
-        inference = CrossRegionInference()
-        inference.demonstrate_cross_region_inference()
+        with CrossRegionInference() as inference:
+            inference.demonstrate_cross_region_inference()
     except KeyboardInterrupt:
         print("\nCross-region inference demonstration interrupted by user")
         sys.exit(1)
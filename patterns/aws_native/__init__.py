@@ -0,0 +1 @@
+"""AWS-native Amazon Bedrock reliability patterns."""
@@ -24,9 +24,14 @@ from typing import Dict, Any, List
 from datetime import datetime
 from pathlib import Path
 
+# Running the file directly has no parent package; make it importable so the
+# relative import below works both as a script and with python -m
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "patterns.custom"
+
 # Import security utilities
-sys.path.append(str(Path(__file__).parent.parent))
-from security_utils import (
+from ..security_utils import (
     validate_model_id, sanitize_prompt, sanitize_error_message,
     get_secure_region, create_secure_log_file, RateLimiter,
     RetryHandler, CircuitBreaker, ResourceManager, validate_config,
@@ -0,0 +1 @@
+"""Custom fallback patterns for Amazon Bedrock reliability."""
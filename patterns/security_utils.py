@@ -6,8 +6,10 @@ Security utilities for Amazon Bedrock Reliability Patterns
 import os
 import re
 import time
+import random
 import signal
 import logging
+import threading
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from contextlib import contextmanager
@@ -24,10 +26,22 @@ ALLOWED_MODEL_PATTERNS = [
     r'^arn:aws:bedrock:.*'  # ARN format for provisioned throughput
 ]
 
+# Compiled once at import so validation does not go through re's pattern cache
+_MODEL_ID_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in ALLOWED_MODEL_PATTERNS))
+_REGION_RE = re.compile(r'^[a-z0-9-]+$')
+
 # Configuration constants
 DEFAULT_TIMEOUT = 30
 MAX_RETRIES = 3
 RETRY_BACKOFF = 1.0
+MAX_BACKOFF = 20.0
+
+# Client errors that will fail the same way on every attempt
+NON_RETRYABLE_ERROR_CODES = frozenset({
+    'ValidationException',
+    'AccessDeniedException',
+    'ResourceNotFoundException'
+})
 
 def validate_model_id(model_id: str) -> bool:
     """
@@ -47,7 +61,7 @@ def validate_model_id(model_id: str) -> bool:
     """
     if not isinstance(model_id, str) or len(model_id) > 200:
         return False
-    return any(re.match(pattern, model_id) for pattern in ALLOWED_MODEL_PATTERNS)
+    return _MODEL_ID_RE.match(model_id) is not None
 
 def sanitize_prompt(prompt: str) -> str:
     """
@@ -80,7 +94,7 @@ def sanitize_error_message(error_msg: str) -> str:
 def get_secure_region() -> str:
     """Get AWS region from environment with validation."""
     region = os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
-    if not re.match(r'^[a-z0-9-]+$', region):
+    if not _REGION_RE.match(region):
         raise ValueError("Invalid region format")
     return region
 
@@ -158,24 +172,40 @@ class RateLimiter:
     def __init__(self, min_interval: float = 0.1):
         self.min_interval = min_interval
         self.last_request_time = 0
+        self._lock = threading.Lock()
 
     def wait_if_needed(self):
         """Wait if needed to respect rate limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_interval:
-            time.sleep(self.min_interval - time_since_last)
-        self.last_request_time = time.time()
+        with self._lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            if time_since_last < self.min_interval:
+                time.sleep(self.min_interval - time_since_last)
+            self.last_request_time = time.time()
 
 class RetryHandler:
-    """Exponential backoff retry handler."""
+    """Exponential backoff retry handler with full jitter.
+
+    Each wait is drawn uniformly from [0, min(max_backoff, backoff * 2**attempt)]
+    so concurrent callers that were throttled together do not retry in lockstep.
+    """
 
-    def __init__(self, max_retries: int = MAX_RETRIES, backoff: float = RETRY_BACKOFF):
+    def __init__(self, max_retries: int = MAX_RETRIES, backoff: float = RETRY_BACKOFF,
+                 max_backoff: float = MAX_BACKOFF):
         self.max_retries = max_retries
         self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Return False for AWS client errors that retrying cannot fix."""
+        response = getattr(error, 'response', None)
+        if not isinstance(response, dict):
+            return True
+        return response.get('Error', {}).get('Code') not in NON_RETRYABLE_ERROR_CODES
 
     def retry_with_backoff(self, func, *args, **kwargs):
-        """Execute function with exponential backoff retry."""
+        """Execute function with jittered exponential backoff retry."""
         last_exception = None
 
         for attempt in range(self.max_retries + 1):
@@ -183,8 +213,8 @@ class RetryHandler:
                 return func(*args, **kwargs)
             except Exception as e:
                 last_exception = e
-                if attempt < self.max_retries:
-                    wait_time = self.backoff * (2 ** attempt)
+                if attempt < self.max_retries and self.is_retryable(e):
+                    wait_time = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
                     time.sleep(wait_time)
                 else:
                     break
@@ -200,30 +230,43 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time = None
         self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
+        self._lock = threading.Lock()
+
+    def should_attempt_reset(self) -> bool:
+        """Return True once the recovery timeout has elapsed since the last failure."""
+        return time.time() - self.last_failure_time > self.recovery_timeout
 
     def call(self, func, *args, **kwargs):
-        """Execute function with circuit breaker protection."""
-        if self.state == 'OPEN':
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = 'HALF_OPEN'
-            else:
-                raise Exception("Circuit breaker is OPEN")
+        """Execute function with circuit breaker protection.
+
+        State is only read and updated under the lock; func itself runs
+        unlocked so concurrent callers are not serialized.
+        """
+        with self._lock:
+            if self.state == 'OPEN':
+                if self.should_attempt_reset():
+                    self.state = 'HALF_OPEN'
+                else:
+                    raise Exception("Circuit breaker is OPEN")
 
         try:
             result = func(*args, **kwargs)
-            if self.state == 'HALF_OPEN':
-                self.state = 'CLOSED'
-                self.failure_count = 0
-            return result
         except Exception as e:
-            self.failure_count += 1
-            self.last_failure_time = time.time()
+            with self._lock:
+                self.failure_count += 1
+                self.last_failure_time = time.time()
 
-            if self.failure_count >= self.failure_threshold:
-                self.state = 'OPEN'
+                if self.failure_count >= self.failure_threshold:
+                    self.state = 'OPEN'
 
             raise e
 
+        with self._lock:
+            if self.state == 'HALF_OPEN':
+                self.state = 'CLOSED'
+                self.failure_count = 0
+        return result
+
 class ResourceManager:
     """Manage resources with cleanup."""
 